@@ -1,7 +1,7 @@
 import requests
 from bs4 import BeautifulSoup
 import re
-import yaml
+import yamlcache
 from datetime import datetime, timedelta
 
 def parse_date_or_range(date_str, year):
@@ -134,14 +134,12 @@ def main():
     class_days = ['Monday', 'Wednesday']
 
     # Load semester info from YAML
-    with open(semester_info_file, 'r') as f:
-        semester_info = yaml.safe_load(f)
+    semester_info = yamlcache.load(semester_info_file)
     term = semester_info.get("Term")
     year = int(semester_info.get("Year"))
 
     # Load the existing schedule
-    with open(schedule_file, 'r') as f:
-        schedule = yaml.safe_load(f)
+    schedule = yamlcache.load(schedule_file)
 
     # Scrape the academic calendar
     semester_start, break_dates = scrape_academic_calendar(calendar_url, term, year)
@@ -155,7 +153,7 @@ def main():
 
     # Save the adjusted schedule
     with open(output_file, 'w') as f:
-        yaml.dump(adjusted_schedule, f, sort_keys=False)
+        yamlcache.dump(adjusted_schedule, f, sort_keys=False)
 
     print(f"Adjusted schedule saved to {output_file}.")
 
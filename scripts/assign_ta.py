@@ -1,7 +1,7 @@
 import argparse
 import json
 import requests
-import yaml
+import yamlcache
 import os
 from pathlib import Path
 
@@ -16,8 +16,7 @@ tas_file = Path('/static/yaml/tas.yaml')
 assignments_file = Path('/static/json/ta_assignment.json')
 
 # Load TA list from YAML
-with tas_file.open() as f:
-    tas = yaml.safe_load(f)
+tas = yamlcache.load(tas_file)
 
 # Load or initialize assignment tracking
 if assignments_file.exists():
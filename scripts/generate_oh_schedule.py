@@ -1,4 +1,4 @@
-import yaml
+import yamlcache
 import json
 
 # Load semester information
@@ -37,6 +37,6 @@ for day, slots in office_hours.items():
 
 # Save to office_hours.yaml
 with open("office_hours.yaml", "w") as f:
-    yaml.dump(office_hours_data, f, sort_keys=False)
+    yamlcache.dump(office_hours_data, f, sort_keys=False)
 
 print("Generated office_hours.yaml")
\ No newline at end of file
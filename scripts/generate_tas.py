@@ -4,9 +4,9 @@ import csv
 import random
 import glob
 import sys
-import yaml
+import yamlcache
 
-TAS      = [ta['github'] for ta in yaml.safe_load(open('../static/yaml/tas.yaml'))]
+TAS      = [ta['github'] for ta in yamlcache.load('../static/yaml/tas.yaml')]
 STUDENTS = []
 
 for student in csv.DictReader(open('../static/csv/students.csv', 'r')):
@@ -15,7 +15,7 @@ for student in csv.DictReader(open('../static/csv/students.csv', 'r')):
 for i in range(0, 12):
     CONFLICTS = dict(
         (ta['github'], ta['conflicts'])
-        for ta in yaml.safe_load(open('../static/yaml/tas.yaml'))
+        for ta in yamlcache.load('../static/yaml/tas.yaml')
         if ta.get('conflicts')
     )
 
@@ -37,4 +37,4 @@ for i in range(0, 12):
     # Write each mapping to a separate file
     filename = f'../static/yaml/homework{i:02}.yaml'
     with open(filename, 'w') as file:
-        yaml.dump(MAPPING, file, default_flow_style=False)
\ No newline at end of file
+        yamlcache.dump(MAPPING, file, default_flow_style=False)
\ No newline at end of file
@@ -4,10 +4,10 @@ import csv
 import random
 import glob
 import sys
-import yaml
+import yamlcache
 
 # Load TAs from semester_info.yaml
-semester_info = yaml.safe_load(open('../static/yaml/semester_info.yaml'))
+semester_info = yamlcache.load('../static/yaml/semester_info.yaml')
 TAS = [ta['github'] for ta in semester_info['TAs'].values()]
 
 TEAMS = set()  # Use a set to store unique team names
@@ -42,4 +42,4 @@ for i in range(1, 6):
     # Write each mapping to a separate file
     filename = f'../static/yaml/homework{i:02}_teams_tas_mapping.yaml'
     with open(filename, 'w') as file:
-        yaml.dump(MAPPING, file, default_flow_style=False)
\ No newline at end of file
+        yamlcache.dump(MAPPING, file, default_flow_style=False)
\ No newline at end of file
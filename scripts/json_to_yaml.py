@@ -1,5 +1,5 @@
 import json
-import yaml
+import yamlcache
 
 def convert_json_to_yaml(json_file, yaml_file):
     # Load JSON data
@@ -8,7 +8,7 @@ def convert_json_to_yaml(json_file, yaml_file):
     
     # Convert to YAML and save
     with open(yaml_file, 'w') as file:
-        yaml.dump(data, file, default_flow_style=False)
+        yamlcache.dump(data, file, default_flow_style=False)
 
 def main():
     convert_json_to_yaml('../static/json/semester_info.json', '../static/yaml/semester_info.yaml')
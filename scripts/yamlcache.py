@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+""" Shared YAML loading for yasb and the helper scripts
+
+Uses the libyaml C loader/dumper when PyYAML was built with it, and keeps a
+pickle of each parsed document under .yasb_cache/yaml keyed by the SHA-1 of
+its contents, so unchanged files are not re-parsed on every build.
+
+Run directly to benchmark cold (parse) and warm (cache) load times:
+
+    ./scripts/yamlcache.py static/yaml/*.yaml pages/*.yaml
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+CACHE_DIR     = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.yasb_cache', 'yaml')
+CACHE_VERSION = 1
+
+def safe_load(stream):
+    return yaml.load(stream, Loader=SafeLoader)
+
+def dump(data, stream=None, **kwargs):
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+def _cache_path(digest):
+    return os.path.join(CACHE_DIR, f'{digest}.pickle')
+
+def _read_cache(digest):
+    """ Return the cached document for digest, or None if it is missing or
+    does not belong to this digest and cache version. """
+    try:
+        with open(_cache_path(digest), 'rb') as f:
+            version, cached_digest, data = pickle.load(f)
+    except Exception:
+        return None
+    if version != CACHE_VERSION or cached_digest != digest:
+        return None
+    return data
+
+def _write_cache(digest, data):
+    """ Atomically write the cache entry for digest; each writer uses its own
+    temporary file so concurrent builds (make -j) never share one. """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((CACHE_VERSION, digest, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, _cache_path(digest))
+    except OSError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+def load(path, use_cache=True):
+    """ Load the YAML document at path, reusing the parse cache when the file
+    contents have not changed. """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    digest = hashlib.sha1(content).hexdigest()
+    if use_cache:
+        data = _read_cache(digest)
+        if data is not None:
+            return data
+
+    data = safe_load(content)
+    if use_cache and data is not None:
+        _write_cache(digest, data)
+    return data
+
+# Benchmark
+
+def _time_loads(paths, use_cache, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in paths:
+            load(path, use_cache)
+    return (time.perf_counter() - start) / rounds
+
+def main():
+    paths  = sys.argv[1:]
+    rounds = 10
+    if not paths:
+        sys.exit(f'usage: {sys.argv[0]} file.yaml ...')
+
+    print(f'loader: {SafeLoader.__name__}, files: {len(paths)}, rounds: {rounds}')
+    print(f'cold:   {_time_loads(paths, False, rounds) * 1000:8.2f} ms')
+    for path in paths:
+        load(path)
+    print(f'warm:   {_time_loads(paths, True, rounds) * 1000:8.2f} ms')
+
+if __name__ == '__main__':
+    main()
+
+# vim: set sts=4 sw=4 ts=8 expandtab ft=python:
@@ -16,9 +16,13 @@
 
 """ Yet Another Static Blogger """
 
+import argparse
 import collections
 import csv
+import hashlib
+import html.parser
 import io
+import json
 import os
 import itertools
 import sys
@@ -29,9 +33,10 @@ import markdown
 import markdown.extensions.codehilite
 import markdown.extensions.toc
 import markdown.extensions.footnotes
-import yaml
 import re
 
+import yamlcache
+
 try:
     import requests  # type: ignore
 except Exception:
@@ -169,8 +174,25 @@ def _load_csv_to_resources_map(src: str):
     return out
 
 
+def validate_page_fields(path, data):
+    """ Check page YAML against the Page fields before loading any external
+    files, so a typo fails with the offending path rather than deep inside
+    template rendering. """
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping of page fields")
+
+    unknown = sorted(set(data) - set(PageFields))
+    missing = sorted(set(PageFields) - set(data) - {'prefix'})
+    if unknown or missing:
+        raise ValueError(f"{path}: unknown fields {unknown}, missing fields {missing}")
+
+    for field, kind in (('title', str), ('body', str), ('navigation', list), ('external', dict)):
+        if data[field] is not None and not isinstance(data[field], kind):
+            raise ValueError(f"{path}: field '{field}' must be a {kind.__name__}")
+
 def load_page_from_yaml(path):
-    data     = yaml.safe_load(open(path))
+    data     = yamlcache.load(path)
+    validate_page_fields(path, data)
     external = data.get('external', {}) or {}
 
     for k, v in external.items():
@@ -178,7 +200,7 @@ def load_page_from_yaml(path):
             src = v[len('csv:'):]
             data['external'][k] = _load_csv_to_resources_map(src)
         else:
-            data['external'][k] = yaml.safe_load(open(v))
+            data['external'][k] = yamlcache.load(v)
 
     if 'prefix' not in data:
         data['prefix'] = ''
@@ -296,9 +318,224 @@ def render_page(page):
     }
     print(template.generate(**settings).decode())
 
+# Search Index
+
+# Bump SEARCH_INDEX_VERSION whenever tokenize or _SectionParser change, since
+# the rendered pages (and so the cached digests) stay the same.
+SEARCH_CACHE_PATH    = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.yasb_cache', 'search.json')
+SEARCH_INDEX_VERSION = 1
+SEARCH_SHARD_CHARS   = 2
+SEARCH_TOKEN_RE      = re.compile(r'[a-z0-9]+')
+SEARCH_STOPWORDS     = frozenset("""
+    an and are as at be but by for from has have if in into is it its of on or
+    so than that the their then there these this to was we were what when which
+    will with you your
+""".split())
+
+def tokenize(text):
+    """ Split text into lowercase search terms, dropping stopwords and single
+    characters. search.js mirrors these rules for queries. """
+    return [
+        term for term in SEARCH_TOKEN_RE.findall((text or '').lower())
+        if len(term) > 1 and term not in SEARCH_STOPWORDS
+    ]
+
+class _SectionParser(html.parser.HTMLParser):
+    """ Split a rendered page into sections at each heading with an id (the
+    anchors emitted by TocExtension), ignoring the site header and footer
+    from base.tmpl. """
+    HEADINGS        = frozenset('h1 h2 h3 h4 h5 h6'.split())
+    SKIPPED         = frozenset('script style footer button'.split())
+    SKIPPED_CLASSES = frozenset(['site-header'])
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title      = ''
+        self.sections   = [['', '', []]]  # anchor, heading, text
+        self.heading    = None
+        self.skip_tag   = None
+        self.skip_depth = 0
+        self.in_title   = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.skip_tag:
+            self.skip_depth += tag == self.skip_tag
+            return
+
+        classes = (dict(attrs).get('class') or '').split()
+        if tag in self.SKIPPED or self.SKIPPED_CLASSES.intersection(classes):
+            self.skip_tag   = tag
+            self.skip_depth = 1
+        elif tag == 'title':
+            self.in_title = True
+        elif tag in self.HEADINGS:
+            self.heading = [dict(attrs).get('id') or '', []]
+
+    def handle_endtag(self, tag):
+        if self.skip_tag:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+                if not self.skip_depth:
+                    self.skip_tag = None
+            return
+
+        if tag == 'title':
+            self.in_title = False
+        elif tag in self.HEADINGS and self.heading is not None:
+            anchor, parts = self.heading
+            text          = ' '.join(''.join(parts).replace('\u00b6', '').split())
+            self.heading  = None
+            if anchor:
+                self.sections.append([anchor, text, [text]])
+            else:
+                self.sections[-1][2].append(text)
+
+    def handle_data(self, data):
+        if self.skip_tag:
+            return
+        if self.in_title:
+            self.title += data.strip()
+        elif self.heading is not None:
+            self.heading[1].append(data)
+        else:
+            self.sections[-1][2].append(data)
+
+def index_page_html(text):
+    """ Return the title, sections and per-section postings for a rendered
+    page as a JSON-serializable dict. """
+    parser = _SectionParser()
+    parser.feed(text)
+    parser.close()
+
+    postings = {}
+    for sid, (_, _, parts) in enumerate(parser.sections):
+        for term in tokenize(' '.join(parts)):
+            postings.setdefault(term, collections.Counter())[sid] += 1
+
+    return {
+        'title'   : parser.title,
+        'sections': [[anchor, heading] for anchor, heading, _ in parser.sections],
+        'postings': {term: sorted(counts.items()) for term, counts in postings.items()},
+    }
+
+def _front_code(terms):
+    """ Prefix-compress sorted terms into [shared prefix length, suffix]. """
+    coded    = []
+    previous = ''
+    for term in terms:
+        shared = 0
+        while shared < min(len(term), len(previous)) and term[shared] == previous[shared]:
+            shared += 1
+        coded.append([shared, term[shared:]])
+        previous = term
+    return coded
+
+def _delta_code(postings):
+    """ Flatten [[doc, tf], ...] into [doc gap, tf, doc gap, tf, ...]. """
+    flat     = []
+    previous = 0
+    for doc, tf in sorted(postings):
+        flat.extend((doc - previous, tf))
+        previous = doc
+    return flat
+
+def _load_search_cache(path):
+    """ Return the cached per-page postings, or an empty cache if the file is
+    missing or was written by a different SEARCH_INDEX_VERSION. """
+    try:
+        with open(path, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != SEARCH_INDEX_VERSION:
+        return {}
+    pages = cache.get('pages')
+    return pages if isinstance(pages, dict) else {}
+
+def build_search_index(paths, outdir, resources=None, cache_path=SEARCH_CACHE_PATH):
+    """ Write a sharded inverted index over the rendered pages in paths (plus
+    any resource names from the CSV map) to outdir.
+
+    Postings for pages whose content hash matches the cache are reused rather
+    than re-tokenized. """
+    cache   = _load_search_cache(cache_path)
+    pages   = {}
+    docs    = []
+    index   = {}
+    rebuilt = 0
+
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+
+        name   = os.path.basename(path)
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        entry  = cache.get(name)
+        if not isinstance(entry, dict) or entry.get('digest') != digest:
+            entry    = dict(index_page_html(text), digest=digest)
+            rebuilt += 1
+        pages[name] = entry
+
+        base = len(docs)
+        for anchor, heading in entry['sections']:
+            docs.append([f'{name}#{anchor}' if anchor else name, entry['title'], heading])
+        for term, postings in entry['postings'].items():
+            index.setdefault(term, []).extend([base + sid, tf] for sid, tf in postings)
+
+    for items in (resources or {}).values():
+        for item in items:
+            doc = len(docs)
+            docs.append([item['link'], item['name'], item.get('type', '')])
+            terms = tokenize(' '.join((item['name'], item.get('type', ''))))
+            for term, tf in collections.Counter(terms).items():
+                index.setdefault(term, []).append([doc, tf])
+
+    shards = {}
+    for term in sorted(index):
+        shards.setdefault(term[:SEARCH_SHARD_CHARS], []).append(term)
+
+    os.makedirs(outdir, exist_ok=True)
+    for stale in os.listdir(outdir):
+        if stale.endswith('.json'):
+            os.remove(os.path.join(outdir, stale))
+
+    for key, terms in shards.items():
+        with open(os.path.join(outdir, f'{key}.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                'terms'   : _front_code(terms),
+                'postings': [_delta_code(index[term]) for term in terms],
+            }, f, separators=(',', ':'))
+
+    with open(os.path.join(outdir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'shard_chars': SEARCH_SHARD_CHARS,
+            'shards'     : sorted(shards),
+            'docs'       : docs,
+        }, f, separators=(',', ':'))
+
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': SEARCH_INDEX_VERSION, 'pages': pages}, f, separators=(',', ':'))
+
+    sys.stderr.write(
+        f"[yasb] search index: pages={len(pages)}, rebuilt={rebuilt}, "
+        f"docs={len(docs)}, terms={len(index)}, shards={len(shards)}\n"
+    )
+
 # Main Execution
 def main():
-    for path in sys.argv[1:]:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('paths', nargs='*', help='page YAML files (or rendered HTML with --index)')
+    parser.add_argument('--index', metavar='OUTDIR', help='build the search index from rendered pages into OUTDIR')
+    parser.add_argument('--resources', metavar='CSV', help='CSV resources map to include in the search index')
+    args = parser.parse_args()
+
+    if args.index:
+        resources = _load_csv_to_resources_map(args.resources) if args.resources else None
+        build_search_index(args.paths, args.index, resources)
+        return
+
+    for path in args.paths:
         page = load_page_from_yaml(path)
         render_page(page)
 
@@ -0,0 +1,146 @@
+/* Client for the sharded search index written by `yasb.py --index`.
+ *
+ * meta.json lists the documents and available shards; each shard holds the
+ * front-coded terms sharing a prefix and their delta-coded postings. Only the
+ * shards needed for the current query are fetched.
+ */
+(function() {
+    var input = document.getElementById('site-search');
+    var list = document.getElementById('site-search-results');
+    if (!input || !list) {
+        return;
+    }
+
+    var base = input.getAttribute('data-index');
+    var prefix = input.getAttribute('data-prefix') || '';
+    var STOPWORDS = ('an and are as at be but by for from has have if in into is it its of on or ' +
+                     'so than that the their then there these this to was we were what when which ' +
+                     'will with you your').split(' ');
+    var MAX_RESULTS = 10;
+    var meta = null;
+    var shards = {};
+
+    function fetchJSON(url) {
+        return fetch(url).then(function(response) {
+            if (!response.ok) {
+                throw new Error(url + ': ' + response.status);
+            }
+            return response.json();
+        });
+    }
+
+    function tokenize(text) {
+        return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter(function(term) {
+            return term.length > 1 && STOPWORDS.indexOf(term) < 0;
+        });
+    }
+
+    function decodeShard(data) {
+        var terms = {};
+        var previous = '';
+        data.terms.forEach(function(entry, i) {
+            var term = previous.slice(0, entry[0]) + entry[1];
+            var flat = data.postings[i];
+            var postings = [];
+            var doc = 0;
+            for (var j = 0; j < flat.length; j += 2) {
+                doc += flat[j];
+                postings.push([doc, flat[j + 1]]);
+            }
+            terms[term] = postings;
+            previous = term;
+        });
+        return terms;
+    }
+
+    function loadMeta() {
+        if (!meta) {
+            meta = fetchJSON(base + 'meta.json');
+        }
+        return meta;
+    }
+
+    function loadShard(m, key) {
+        if (m.shards.indexOf(key) < 0) {
+            return Promise.resolve({});
+        }
+        if (!shards[key]) {
+            shards[key] = fetchJSON(base + key + '.json').then(decodeShard);
+        }
+        return shards[key];
+    }
+
+    /* Score each document by summed term frequency; every query term must
+     * match, and the last one is treated as a prefix while typing. */
+    function search(query) {
+        var terms = tokenize(query);
+        if (!terms.length) {
+            return Promise.resolve([]);
+        }
+        return loadMeta().then(function(m) {
+            return Promise.all(terms.map(function(term) {
+                return loadShard(m, term.slice(0, m.shard_chars));
+            })).then(function(loaded) {
+                var scores = null;
+                terms.forEach(function(term, i) {
+                    var hits = {};
+                    var isLast = i === terms.length - 1;
+                    Object.keys(loaded[i]).forEach(function(candidate) {
+                        if (candidate === term || (isLast && candidate.indexOf(term) === 0)) {
+                            loaded[i][candidate].forEach(function(posting) {
+                                hits[posting[0]] = (hits[posting[0]] || 0) + posting[1];
+                            });
+                        }
+                    });
+                    if (scores === null) {
+                        scores = hits;
+                        return;
+                    }
+                    Object.keys(scores).forEach(function(doc) {
+                        if (hits[doc]) {
+                            scores[doc] += hits[doc];
+                        } else {
+                            delete scores[doc];
+                        }
+                    });
+                });
+                return Object.keys(scores).sort(function(a, b) {
+                    return scores[b] - scores[a];
+                }).slice(0, MAX_RESULTS).map(function(doc) {
+                    return m.docs[doc];
+                });
+            });
+        });
+    }
+
+    /* Page links in the index are relative to the site root; resource links
+     * are absolute URLs and are used unchanged. */
+    function resolve(url) {
+        return /^([a-z][a-z0-9+.-]*:|\/)/i.test(url) ? url : prefix + url;
+    }
+
+    function render(results) {
+        list.innerHTML = '';
+        results.forEach(function(doc) {
+            var item = document.createElement('li');
+            var link = document.createElement('a');
+            link.setAttribute('href', resolve(doc[0]));
+            link.textContent = doc[2] ? doc[1] + ' › ' + doc[2] : doc[1];
+            item.appendChild(link);
+            list.appendChild(item);
+        });
+        list.style.display = results.length ? 'block' : 'none';
+    }
+
+    var pending = 0;
+    input.addEventListener('input', function() {
+        var request = ++pending;
+        search(input.value).then(function(results) {
+            if (request === pending) {
+                render(results);
+            }
+        }).catch(function() {
+            render([]);
+        });
+    });
+})();